@@ -1,4 +1,5 @@
 import os
+import math
 import logging
 import numpy as np
 from collections import deque
@@ -27,9 +28,10 @@ class BaseSimulator(ABC):
         self.__dt = dt
         self.model = ""
         self._geodetic = np.zeros(3)
-        self._position = np.zeros(3)
+        self._feature = np.zeros(6)     # position & velocity share one contiguous buffer
+        self._position = self._feature[:3]
         self._posture = np.zeros(3)
-        self._velocity = np.zeros(3)
+        self._velocity = self._feature[3:]
         logging.debug(f"{self.__class__.__name__}:{self.__uid} is created!")
 
     @property
@@ -60,11 +62,16 @@ class BaseSimulator(ABC):
         """(v_north, v_east, v_up), unit: m/s"""
         return self._velocity
 
+    def get_feature(self):
+        """(north, east, up, v_north, v_east, v_up), unit: m, m/s"""
+        return self._feature
+
     def reload(self):
         self._geodetic = np.zeros(3)
-        self._position = np.zeros(3)
+        self._feature = np.zeros(6)
+        self._position = self._feature[:3]
         self._posture = np.zeros(3)
-        self._velocity = np.zeros(3)
+        self._velocity = self._feature[3:]
 
     @abstractmethod
     def run(self, **kwargs):
@@ -397,7 +404,7 @@ class MissileSimulator(BaseSimulator):
     def S(self):
         """Cross-Sectional area, unit m^2"""
         S0 = np.pi * (self._Diameter / 2)**2
-        S0 += np.linalg.norm([np.sin(self._dtheta), np.sin(self._dphi)]) * self._Diameter * self._Length
+        S0 += math.hypot(math.sin(self._dtheta), math.sin(self._dphi)) * self._Diameter * self._Length
         return S0
 
     @property
@@ -483,12 +490,12 @@ class MissileSimulator(BaseSimulator):
         """
         x_m, y_m, z_m = self.get_position()
         dx_m, dy_m, dz_m = self.get_velocity()
-        v_m = np.linalg.norm([dx_m, dy_m, dz_m])
+        v_m = math.hypot(dx_m, dy_m, dz_m)
         theta_m = np.arcsin(dz_m / v_m)
         x_t, y_t, z_t = self.target_aircraft.get_position()
         dx_t, dy_t, dz_t = self.target_aircraft.get_velocity()
-        Rxy = np.linalg.norm([x_m - x_t, y_m - y_t])  # distance from missile to target project to X-Y plane
-        Rxyz = np.linalg.norm([x_m - x_t, y_m - y_t, z_t - z_m])  # distance from missile to target
+        Rxy = math.hypot(x_m - x_t, y_m - y_t)  # distance from missile to target project to X-Y plane
+        Rxyz = math.hypot(x_m - x_t, y_m - y_t, z_t - z_m)  # distance from missile to target
         # calculate beta & eps, but no need actually...
         # beta = np.arctan2(y_m - y_t, x_m - x_t)  # relative yaw
         # eps = np.arctan2(z_m - z_t, np.linalg.norm([x_m - x_t, y_m - y_t]))  # relative pitch
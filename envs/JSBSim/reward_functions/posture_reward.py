@@ -1,7 +1,6 @@
-import numpy as np
-from wandb import agent
+import math
+from functools import partial
 from .reward_function_base import BaseRewardFunction
-from ..utils.utils import get_AO_TA_R
 
 
 class PostureReward(BaseRewardFunction):
@@ -35,13 +34,8 @@ class PostureReward(BaseRewardFunction):
             (float): reward
         """
         new_reward = 0
-        # feature: (north, east, down, vn, ve, vd)
-        ego_feature = np.hstack([env.agents[agent_id].get_position(),
-                                 env.agents[agent_id].get_velocity()])
         for enm in env.agents[agent_id].enemies:
-            enm_feature = np.hstack([enm.get_position(),
-                                    enm.get_velocity()])
-            AO, TA, R = get_AO_TA_R(ego_feature, enm_feature)
+            AO, TA, R = task.get_AO_TA_R(env, agent_id, enm.uid)
             orientation_reward = self.orientation_fn(AO, TA)
             range_reward = self.range_fn(R / 1000)
             new_reward += orientation_reward * range_reward
@@ -49,27 +43,77 @@ class PostureReward(BaseRewardFunction):
 
     def get_orientation_function(self, version):
         if version == 'v0':
-            return lambda AO, TA: (1. - np.tanh(9 * (AO - np.pi / 9))) / 3. + 1 / 3. \
-                + min((np.arctanh(1. - max(2 * TA / np.pi, 1e-4))) / (2 * np.pi), 0.) + 0.5
+            return _orientation_v0
         elif version == 'v1':
-            return lambda AO, TA: (1. - np.tanh(2 * (AO - np.pi / 2))) / 2. \
-                * (np.arctanh(1. - max(2 * TA / np.pi, 1e-4))) / (2 * np.pi) + 0.5
+            return _orientation_v1
         elif version == 'v2':
-            return lambda AO, TA: 1 / (50 * AO / np.pi + 2) + 1 / 2 \
-                + min((np.arctanh(1. - max(2 * TA / np.pi, 1e-4))) / (2 * np.pi), 0.) + 0.5
+            return _orientation_v2
         else:
             raise NotImplementedError(f"Unknown orientation function version: {version}")
 
     def get_range_funtion(self, version):
         if version == 'v0':
-            return lambda R: np.exp(-(R - self.target_dist) ** 2 * 0.004) / (1. + np.exp(-(R - self.target_dist + 2) * 2))
+            return partial(_range_v0, target_dist=self.target_dist)
         elif version == 'v1':
-            return lambda R: np.clip(1.2 * np.min([np.exp(-(R - self.target_dist) * 0.21), 1]) /
-                                     (1. + np.exp(-(R - self.target_dist + 1) * 0.8)), 0.3, 1)
+            return partial(_range_v1, target_dist=self.target_dist)
         elif version == 'v2':
-            return lambda R: max(np.clip(1.2 * np.min([np.exp(-(R - self.target_dist) * 0.21), 1]) /
-                                         (1. + np.exp(-(R - self.target_dist + 1) * 0.8)), 0.3, 1), np.sign(7 - R))
+            return partial(_range_v2, target_dist=self.target_dist)
         elif version == 'v3':
-            return lambda R: 1 * (R < 5) + (R >= 5) * np.clip(-0.032 * R**2 + 0.284 * R + 0.38, 0, 1) + np.clip(np.exp(-0.16 * R), 0, 0.2)
+            return _range_v3
         else:
             raise NotImplementedError(f"Unknown range function version: {version}")
+
+
+# NOTE: AO/TA/R are 0-d scalars (np.float64 from the pair arrays, or float), so scalar `math` calls
+# are used instead of numpy ufuncs, which carry array dispatch overhead for a single value.
+_PI_9 = math.pi / 9
+_PI_2 = math.pi / 2
+_INV_PI = 1 / math.pi
+_INV_2PI = 1 / (2 * math.pi)
+_2_OVER_PI = 2 / math.pi
+
+
+def _atanh(x):
+    # keep np.arctanh semantics at the boundary instead of raising ValueError
+    return math.atanh(x) if x > -1. else -math.inf
+
+
+def _orientation_v0(AO, TA):
+    return (1. - math.tanh(9 * (AO - _PI_9))) / 3. + 1 / 3. \
+        + min(_atanh(1. - max(TA * _2_OVER_PI, 1e-4)) * _INV_2PI, 0.) + 0.5
+
+
+def _orientation_v1(AO, TA):
+    return (1. - math.tanh(2 * (AO - _PI_2))) * 0.5 \
+        * _atanh(1. - max(TA * _2_OVER_PI, 1e-4)) * _INV_2PI + 0.5
+
+
+def _orientation_v2(AO, TA):
+    return 1. / (50 * AO * _INV_PI + 2) + 0.5 \
+        + min(_atanh(1. - max(TA * _2_OVER_PI, 1e-4)) * _INV_2PI, 0.) + 0.5
+
+
+def _range_v0(R, target_dist):
+    return math.exp(-(R - target_dist) ** 2 * 0.004) / (1. + math.exp(-(R - target_dist + 2) * 2))
+
+
+def _range_v1(R, target_dist):
+    value = 1.2 * min(math.exp(-(R - target_dist) * 0.21), 1.) / (1. + math.exp(-(R - target_dist + 1) * 0.8))
+    if value < 0.3:
+        return 0.3
+    elif value > 1.:
+        return 1.
+    return value
+
+
+def _range_v2(R, target_dist):
+    return max(_range_v1(R, target_dist), float(R < 7) - float(R > 7))
+
+
+def _range_v3(R):
+    if R < 5:
+        value = 1.
+    else:
+        value = min(max(-0.032 * R**2 + 0.284 * R + 0.38, 0.), 1.)
+    return value + min(math.exp(-0.16 * R), 0.2)
+
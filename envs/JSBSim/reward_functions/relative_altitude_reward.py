@@ -1,4 +1,3 @@
-import numpy as np
 from .reward_function_base import BaseRewardFunction
 
 
@@ -28,5 +27,5 @@ class RelativeAltitudeReward(BaseRewardFunction):
         """
         ego_z = env.agents[agent_id].get_position()[-1] / 1000    # unit: km
         enm_z = env.agents[agent_id].enemies[0].get_position()[-1] / 1000    # unit: km
-        new_reward = min(self.KH - np.abs(ego_z - enm_z), 0)
+        new_reward = min(self.KH - abs(ego_z - enm_z), 0)
         return self._process(new_reward, agent_id)
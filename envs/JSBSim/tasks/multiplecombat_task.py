@@ -233,7 +233,7 @@ class HierarchicalMultipleCombatShootTask(HierarchicalMultipleCombatTask):
         # (3) missile info TODO: multiple missile and parnter's missile?
         missile_sim = env.agents[agent_id].check_missile_warning() #
         if missile_sim is not None:
-            missile_feature = np.concatenate((missile_sim.get_position(), missile_sim.get_velocity()))
+            missile_feature = missile_sim.get_feature()
             ego_AO, ego_TA, R, side_flag = get_AO_TA_R(ego_feature, missile_feature, return_side=True)
             norm_obs[offset + 1] = (np.linalg.norm(missile_sim.get_velocity()) - ego_state[9]) / 340
             norm_obs[offset + 2] = (missile_feature[2] - ego_state[2]) / 1000
@@ -1,3 +1,4 @@
+import math
 import torch
 import numpy as np
 from gym import spaces
@@ -7,7 +8,7 @@ from ..core.simulatior import AircraftSimulator
 from ..core.catalog import Catalog as c
 from ..termination_conditions import ExtremeState, LowAltitude, Overload, Timeout, SafeReturn
 from ..reward_functions import AltitudeReward, PostureReward, EventDrivenReward
-from ..utils.utils import get_AO_TA_R, get2d_AO_TA_R, in_range_rad, LLA2NEU, get_root_dir
+from ..utils.utils import get2d_AO_TA_R, get2d_AO_TA_R_pair, in_range_rad, LLA2NEU, get_root_dir
 from ..model.baseline_actor import BaselineActor
 
 
@@ -18,6 +19,13 @@ class SingleCombatTask(BaseTask):
         self.use_artillery = getattr(self.config, 'use_artillery', False)
         if self.use_baseline:
             self.baseline_agent = self.load_agent(self.config.baseline_type)
+        # discrete action index => continuous command (see `action_var` for value ranges),
+        # as one flattened lookup table of the 4 action dims: [41, 41, 41, 30]
+        self._act_lut = np.hstack([np.linspace(-1., 1., 41)] * 3 + [np.linspace(0.4, 0.9, 30)])
+        self._act_lut_offset = np.array([0, 41, 82, 123])
+        self._act_lut_max = np.array([40, 40, 40, 29])
+        # agent_id => ((ego sim_time, enm sim_time), obs), filled by the paired `get_obs` call
+        self._obs_cache = {}
 
         self.reward_functions = [
             AltitudeReward(self.config),
@@ -80,7 +88,8 @@ class SingleCombatTask(BaseTask):
 
     def get_obs(self, env, agent_id):
         """
-        Convert simulation states into the format of observation_space
+        Convert simulation states into the format of observation_space.
+        Cached on both agents' sim time (like `BaseTask.get_AO_TA_R`), valid until either simulator runs again.
 
         ------
         Returns: (np.ndarray)
@@ -102,34 +111,26 @@ class SingleCombatTask(BaseTask):
             - [13] relative distance     (unit: 10km)
             - [14] side_flag             1 or 0 or -1
         """
-        norm_obs = np.zeros(15)
-        ego_obs_list = np.array(env.agents[agent_id].get_property_values(self.state_var))
-        enm_obs_list = np.array(env.agents[agent_id].enemies[0].get_property_values(self.state_var))
-        # (0) extract feature: [north(km), east(km), down(km), v_n(mh), v_e(mh), v_d(mh)]
-        ego_cur_ned = LLA2NEU(*ego_obs_list[:3], env.center_lon, env.center_lat, env.center_alt)
-        enm_cur_ned = LLA2NEU(*enm_obs_list[:3], env.center_lon, env.center_lat, env.center_alt)
-        ego_feature = np.array([*ego_cur_ned, *(ego_obs_list[6:9])])
-        enm_feature = np.array([*enm_cur_ned, *(enm_obs_list[6:9])])
-        # (1) ego info normalization
-        norm_obs[0] = ego_obs_list[2] / 5000            # 0. ego altitude   (unit: 5km)
-        norm_obs[1] = np.sin(ego_obs_list[3])           # 1. ego_roll_sin
-        norm_obs[2] = np.cos(ego_obs_list[3])           # 2. ego_roll_cos
-        norm_obs[3] = np.sin(ego_obs_list[4])           # 3. ego_pitch_sin
-        norm_obs[4] = np.cos(ego_obs_list[4])           # 4. ego_pitch_cos
-        norm_obs[5] = ego_obs_list[9] / 340             # 5. ego v_body_x   (unit: mh)
-        norm_obs[6] = ego_obs_list[10] / 340            # 6. ego v_body_y   (unit: mh)
-        norm_obs[7] = ego_obs_list[11] / 340            # 7. ego v_body_z   (unit: mh)
-        norm_obs[8] = ego_obs_list[12] / 340            # 8. ego vc   (unit: mh)
-        # (2) relative info w.r.t enm state
-        ego_AO, ego_TA, R, side_flag = get2d_AO_TA_R(ego_feature, enm_feature, return_side=True)
-        norm_obs[9] = (enm_obs_list[9] - ego_obs_list[9]) / 340
-        norm_obs[10] = (enm_obs_list[2] - ego_obs_list[2]) / 1000
-        norm_obs[11] = ego_AO
-        norm_obs[12] = ego_TA
-        norm_obs[13] = R / 10000
-        norm_obs[14] = side_flag
-        norm_obs = np.clip(norm_obs, self.observation_space.low, self.observation_space.high)
-        return norm_obs
+        ego_sim = env.agents[agent_id]
+        enm_sim = ego_sim.enemies[0]
+        cache_key = (ego_sim.get_sim_time(), enm_sim.get_sim_time())
+        cached_key, cached_obs = self._obs_cache.get(agent_id, (None, None))
+        if cached_key == cache_key:
+            return cached_obs
+        norm_obs = self._normalize_observation(env, ego_sim, enm_sim)
+        # 1v1 observations are computed in pairs, keep the enemy's one for its own call
+        self._obs_cache[enm_sim.uid] = (cache_key[::-1], norm_obs[1].copy())
+        return norm_obs[0]
+
+    def _normalize_observation(self, env, ego_sim, enm_sim):
+        """Normalize observations of an ego/enm pair at once.
+
+        Returns: (np.ndarray) with shape (2, 15), row 0 for ego and row 1 for enm
+        """
+        obs_list = np.array([ego_sim.get_property_values(self.state_var),
+                             enm_sim.get_property_values(self.state_var)])
+        norm_obs, _ = normalize_pair_observation(obs_list, env.center_lon, env.center_lat, env.center_alt)
+        return np.clip(norm_obs, self.observation_space.low, self.observation_space.high, out=norm_obs)
 
     def normalize_action(self, env, agent_id, action):
         """Convert discrete action index into continuous value.
@@ -138,17 +139,18 @@ class SingleCombatTask(BaseTask):
             action = self.baseline_agent.get_action(env.agents[agent_id])
             return action
         else:
-            norm_act = np.zeros(4)
-            norm_act[0] = action[0] / 20  - 1.
-            norm_act[1] = action[1] / 20 - 1.
-            norm_act[2] = action[2] / 20 - 1.
-            norm_act[3] = action[3] / 58 + 0.4
-            return norm_act
+            return self._decode_action(action)
+
+    def _decode_action(self, action):
+        # clip per dim, so that an out-of-range index never reads its neighbour dim's entries
+        index = np.clip(np.asarray(action, dtype=np.intp), 0, self._act_lut_max)
+        return np.take(self._act_lut, self._act_lut_offset + index)
 
     def reset(self, env):
         """Task-specific reset, include reward function reset.
         """
         self._agent_die_flag = {}
+        self._obs_cache.clear()
         if self.use_baseline:
             self.baseline_agent.reset()
         return super().reset(env)
@@ -169,13 +171,9 @@ class SingleCombatTask(BaseTask):
                 return 0
         if self.use_artillery:
             for agent_id in env.agents.keys():
-                ego_feature = np.hstack([env.agents[agent_id].get_position(),
-                                        env.agents[agent_id].get_velocity()])
                 for enm in env.agents[agent_id].enemies:
                     if enm.is_alive:
-                        enm_feature = np.hstack([enm.get_position(),
-                                                enm.get_velocity()])
-                        AO, _, R = get_AO_TA_R(ego_feature, enm_feature)
+                        AO, _, R = self.get_AO_TA_R(env, agent_id, enm.uid)
                         enm.bloods -= _orientation_fn(AO) * _distance_fn(R/1000)
                         # if agent_id == 'A0100' and enm.uid == 'B0100':
                         #     print(f"AO: {AO * 180 / np.pi}, {_orientation_fn(AO)}, dis:{R/1000}, {_distance_fn(R/1000)}")
@@ -199,6 +197,7 @@ class SingleCombatTask(BaseTask):
         else:
             raise NotImplementedError
 
+
 class HierarchicalSingleCombatTask(SingleCombatTask):
 
     def __init__(self, config: str):
@@ -235,12 +234,7 @@ class HierarchicalSingleCombatTask(SingleCombatTask):
             action = _action.detach().cpu().numpy().squeeze(0)
             self._inner_rnn_states[agent_id] = _rnn_states.detach().cpu().numpy()
             # normalize low-level action
-            norm_act = np.zeros(4)
-            norm_act[0] = action[0] / 20 - 1.
-            norm_act[1] = action[1] / 20 - 1.
-            norm_act[2] = action[2] / 20 - 1.
-            norm_act[3] = action[3] / 58 + 0.4
-            return norm_act
+            return self._decode_action(action)
 
     def reset(self, env):
         """Task-specific reset, include reward function reset.
@@ -339,12 +333,13 @@ class PursueAgent(BaselineAgent):
         # delta altitude
         delta_altitude = enm_z - ego_z
         # delta heading
-        ego_v = np.linalg.norm([ego_vx, ego_vy])
+        ego_v = math.hypot(ego_vx, ego_vy)
         delta_x, delta_y = enm_x - ego_x, enm_y - ego_y
-        R = np.linalg.norm([delta_x, delta_y])
+        R = math.hypot(delta_x, delta_y)
         proj_dist = delta_x * ego_vx + delta_y * ego_vy
         ego_AO = np.arccos(np.clip(proj_dist / (R * ego_v + 1e-8), -1, 1))
-        side_flag = np.sign(np.cross([ego_vx, ego_vy], [delta_x, delta_y]))
+        cross = ego_vx * delta_y - ego_vy * delta_x
+        side_flag = float(cross > 0) - float(cross < 0)
         delta_heading = ego_AO * side_flag
         # delta velocity
         delta_velocity = sim.enemies[0].get_property_value(c.velocities_u_mps) - \
@@ -418,38 +413,20 @@ class DodgeMissileAgent:
 
     def get_observation(self, sim: AircraftSimulator):
         norm_obs = np.zeros(21)
-        ego_obs_list = np.array(sim.get_property_values(self.state_var))
-        enm_obs_list = np.array(sim.enemies[0].get_property_values(self.state_var))
-        # (0) extract feature: [north(km), east(km), down(km), v_n(mh), v_e(mh), v_d(mh)]
-        ego_cur_ned = LLA2NEU(*ego_obs_list[:3], 120.0, 60.0, 0.0)
-        enm_cur_ned = LLA2NEU(*enm_obs_list[:3], 120.0, 60.0, 0.0)
-        ego_feature = np.array([*ego_cur_ned, *(ego_obs_list[6:9])])
-        enm_feature = np.array([*enm_cur_ned, *(enm_obs_list[6:9])])
-        # (1) ego info normalization
-        norm_obs[0] = ego_obs_list[2] / 5000            # 0. ego altitude   (unit: 5km)
-        norm_obs[1] = np.sin(ego_obs_list[3])           # 1. ego_roll_sin
-        norm_obs[2] = np.cos(ego_obs_list[3])           # 2. ego_roll_cos
-        norm_obs[3] = np.sin(ego_obs_list[4])           # 3. ego_pitch_sin
-        norm_obs[4] = np.cos(ego_obs_list[4])           # 4. ego_pitch_cos
-        norm_obs[5] = ego_obs_list[9] / 340             # 5. ego v_body_x   (unit: mh)
-        norm_obs[6] = ego_obs_list[10] / 340            # 6. ego v_body_y   (unit: mh)
-        norm_obs[7] = ego_obs_list[11] / 340            # 7. ego v_body_z   (unit: mh)
-        norm_obs[8] = ego_obs_list[12] / 340            # 8. ego vc   (unit: mh)
-        # (2) relative info w.r.t enm state
-        ego_AO, ego_TA, R, side_flag = get2d_AO_TA_R(ego_feature, enm_feature, return_side=True)
-        norm_obs[9] = (enm_obs_list[9] - ego_obs_list[9]) / 340
-        norm_obs[10] = (enm_obs_list[2] - ego_obs_list[2]) / 1000
-        norm_obs[11] = ego_AO
-        norm_obs[12] = ego_TA
-        norm_obs[13] = R / 10000
-        norm_obs[14] = side_flag
+        obs_list = np.array([sim.get_property_values(self.state_var),
+                             sim.enemies[0].get_property_values(self.state_var)])
+        ego_obs_list = obs_list[0]
+        # (0)~(2) ego info & relative enm info, same as SingleCombatTask
+        pair_obs, feature = normalize_pair_observation(obs_list, 120.0, 60.0, 0.0)
+        norm_obs[:15] = pair_obs[0]
+        ego_feature = feature[0]
         # (3) relative missile info
         if len(sim.under_missiles) != 0 and sim.under_missiles[0].is_alive:
             missile_sim = sim.under_missiles[0]
         else:
             missile_sim = None
         if missile_sim is not None:
-            missile_feature = np.concatenate((missile_sim.get_position(), missile_sim.get_velocity()))
+            missile_feature = missile_sim.get_feature()
             ego_AO, ego_TA, R, side_flag = get2d_AO_TA_R(ego_feature, missile_feature, return_side=True)
             norm_obs[15] = (np.linalg.norm(missile_sim.get_velocity()) - ego_obs_list[9]) / 340
             norm_obs[16] = (missile_feature[2] - ego_obs_list[2]) / 1000
@@ -467,4 +444,45 @@ class DodgeMissileAgent:
         return action
 
     def reset(self):
-        self.rnn_states = np.zeros((1, 1, 128))
\ No newline at end of file
+        self.rnn_states = np.zeros((1, 1, 128))
+
+
+# raw observation => observation unit (see `SingleCombatTask.get_obs`), as reciprocal multipliers
+OBS_SCALE = np.array([1 / 5000, 1., 1., 1., 1., 1 / 340, 1 / 340, 1 / 340, 1 / 340,
+                      1 / 340, 1 / 1000, 1., 1., 1 / 10000, 1.])
+
+
+def normalize_pair_observation(obs_list, lon0, lat0, alt0):
+    """Normalize raw states of an ego/enm pair into the 15 observation items of `SingleCombatTask.get_obs`.
+
+    Args:
+        obs_list (np.ndarray): (2, N) raw `state_var` values (N >= 13), row 0 for ego and row 1 for enm
+        lon0, lat0, alt0 (float): observer geodetic lontitude(°), latitude(°), altitude(m)
+
+    Returns:
+        (tuple):
+            norm_obs (np.ndarray): (2, 15) observation of each row w.r.t. the other one
+            feature (np.ndarray): (2, 6) [north, east, up, v_n, v_e, v_d] of each row, unit: m, m/s
+    """
+    rel_obs_list = obs_list[::-1]
+    # (0) extract feature: [north(m), east(m), up(m), v_n(m/s), v_e(m/s), v_d(m/s)]
+    feature = np.zeros((2, 6))
+    feature[:, :3] = LLA2NEU(*obs_list[:, :3].T, lon0, lat0, alt0).T
+    feature[:, 3:] = obs_list[:, 6:9]
+    # (1) ego info normalization
+    norm_obs = np.zeros((2, 15))
+    norm_obs[:, 0] = obs_list[:, 2]                     # 0. ego altitude   (unit: m)
+    norm_obs[:, 1:5:2] = np.sin(obs_list[:, 3:5])       # 1. ego_roll_sin, 3. ego_pitch_sin
+    norm_obs[:, 2:5:2] = np.cos(obs_list[:, 3:5])       # 2. ego_roll_cos, 4. ego_pitch_cos
+    norm_obs[:, 5:9] = obs_list[:, 9:13]                # 5~8. ego v_body_x/y/z, vc   (unit: m/s)
+    # (2) relative info w.r.t enm state
+    ego_AO, ego_TA, R, side_flag = get2d_AO_TA_R_pair(feature[0], feature[1], return_side=True)
+    norm_obs[:, 9] = rel_obs_list[:, 9] - obs_list[:, 9]
+    norm_obs[:, 10] = rel_obs_list[:, 2] - obs_list[:, 2]
+    norm_obs[:, 11] = ego_AO
+    norm_obs[:, 12] = ego_TA
+    norm_obs[:, 13] = R
+    norm_obs[:, 14] = side_flag
+    # (3) raw units => observation units
+    norm_obs *= OBS_SCALE
+    return norm_obs, feature
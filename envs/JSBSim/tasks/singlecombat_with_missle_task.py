@@ -87,7 +87,7 @@ class SingleCombatDodgeMissileTask(SingleCombatTask):
         # (3) relative missile info
         missile_sim = env.agents[agent_id].check_missile_warning()
         if missile_sim is not None:
-            missile_feature = np.concatenate((missile_sim.get_position(), missile_sim.get_velocity()))
+            missile_feature = missile_sim.get_feature()
             ego_AO, ego_TA, R, side_flag = get_AO_TA_R(ego_feature, missile_feature, return_side=True)
             norm_obs[15] = (np.linalg.norm(missile_sim.get_velocity()) - ego_obs_list[9]) / 340
             norm_obs[16] = (missile_feature[2] - ego_obs_list[2]) / 1000
@@ -109,10 +109,8 @@ class SingleCombatDodgeMissileTask(SingleCombatTask):
         SingleCombatTask.step(self, env)
         for agent_id, agent in env.agents.items():
             # [Rule-based missile launch]
-            target = agent.enemies[0].get_position() - agent.get_position()
-            heading = agent.get_velocity()
-            distance = np.linalg.norm(target)
-            attack_angle = np.rad2deg(np.arccos(np.clip(np.sum(target * heading) / (distance * np.linalg.norm(heading) + 1e-8), -1, 1)))
+            AO, _, distance = self.get_AO_TA_R(env, agent_id, agent.enemies[0].uid)
+            attack_angle = np.rad2deg(AO)
             self.lock_duration[agent_id].append(attack_angle < self.max_attack_angle)
             shoot_interval = env.current_step - self._last_shoot_time[agent_id]
 
@@ -3,6 +3,7 @@ from gym import spaces
 from typing import List, Tuple
 from abc import ABC, abstractmethod
 from ..core.catalog import Catalog as c
+from ..utils.utils import get_AO_TA_R_pair
 
 
 class BaseTask(ABC):
@@ -15,6 +16,8 @@ class BaseTask(ABC):
         self.config = config
         self.reward_functions = []
         self.termination_conditions = []
+        # (ego_id, enm_id) => ((ego sim_time, enm sim_time), (AO, TA, R))
+        self._AO_TA_R_cache = {}
         self.load_variables()
         self.load_observation_space()
         self.load_action_space()
@@ -57,6 +60,7 @@ class BaseTask(ABC):
         Args:
             env: environment instance
         """
+        self._AO_TA_R_cache.clear()
         for reward_function in self.reward_functions:
             reward_function.reset(self, env)
 
@@ -87,6 +91,31 @@ class BaseTask(ABC):
             reward += reward_function.get_reward(self, env, agent_id)
         return reward, info
 
+    def get_AO_TA_R(self, env, ego_id, enm_id) -> Tuple[float, float, float]:
+        """
+        AO, TA and R of `ego_id` w.r.t. `enm_id` at the current simulation time.
+        Cached on both agents' sim time and shared with the reverse pair, so that task step and
+        reward functions evaluate each pair's geometry only once. A cached entry stays valid
+        until either simulator runs again, wherever in `env.step` it is queried.
+
+        Args:
+            env: environment instance
+            ego_id: ego agent id
+            enm_id: enemy agent id
+
+        Returns:
+            (tuple): ego_AO, ego_TA, R
+        """
+        ego_sim, enm_sim = env.agents[ego_id], env.agents[enm_id]
+        cache_key = (ego_sim.get_sim_time(), enm_sim.get_sim_time())
+        cached_key, cached_value = self._AO_TA_R_cache.get((ego_id, enm_id), (None, None))
+        if cached_key == cache_key:
+            return cached_value
+        AO, TA, R = get_AO_TA_R_pair(ego_sim.get_feature(), enm_sim.get_feature())
+        self._AO_TA_R_cache[(enm_id, ego_id)] = (cache_key[::-1], (AO[1], TA[1], R))
+        self._AO_TA_R_cache[(ego_id, enm_id)] = (cache_key, (AO[0], TA[0], R))
+        return AO[0], TA[0], R
+
     def get_termination(self, env, agent_id, info={}) -> Tuple[bool, dict]:
         """
         Aggregate termination conditions
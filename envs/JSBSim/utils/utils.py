@@ -1,4 +1,5 @@
 import os
+import math
 import yaml
 import pymap3d
 import numpy as np
@@ -64,11 +65,11 @@ def get_AO_TA_R(ego_feature, enm_feature, return_side=False):
         (tuple): ego_AO, ego_TA, R
     """
     ego_x, ego_y, ego_z, ego_vx, ego_vy, ego_vz = ego_feature
-    ego_v = np.linalg.norm([ego_vx, ego_vy, ego_vz])
+    ego_v = math.hypot(ego_vx, ego_vy, ego_vz)
     enm_x, enm_y, enm_z, enm_vx, enm_vy, enm_vz = enm_feature
-    enm_v = np.linalg.norm([enm_vx, enm_vy, enm_vz])
+    enm_v = math.hypot(enm_vx, enm_vy, enm_vz)
     delta_x, delta_y, delta_z = enm_x - ego_x, enm_y - ego_y, enm_z - ego_z
-    R = np.linalg.norm([delta_x, delta_y, delta_z])
+    R = math.hypot(delta_x, delta_y, delta_z)
 
     proj_dist = delta_x * ego_vx + delta_y * ego_vy + delta_z * ego_vz
     ego_AO = np.arccos(np.clip(proj_dist / (R * ego_v + 1e-8), -1, 1))
@@ -78,17 +79,18 @@ def get_AO_TA_R(ego_feature, enm_feature, return_side=False):
     if not return_side:
         return ego_AO, ego_TA, R
     else:
-        side_flag = np.sign(np.cross([ego_vx, ego_vy], [delta_x, delta_y]))
+        cross = ego_vx * delta_y - ego_vy * delta_x
+        side_flag = float(cross > 0) - float(cross < 0)
         return ego_AO, ego_TA, R, side_flag
 
 
 def get2d_AO_TA_R(ego_feature, enm_feature, return_side=False):
     ego_x, ego_y, ego_z, ego_vx, ego_vy, ego_vz = ego_feature
-    ego_v = np.linalg.norm([ego_vx, ego_vy])
+    ego_v = math.hypot(ego_vx, ego_vy)
     enm_x, enm_y, enm_z, enm_vx, enm_vy, enm_vz = enm_feature
-    enm_v = np.linalg.norm([enm_vx, enm_vy])
+    enm_v = math.hypot(enm_vx, enm_vy)
     delta_x, delta_y, delta_z = enm_x - ego_x, enm_y - ego_y, enm_z - ego_z
-    R = np.linalg.norm([delta_x, delta_y])
+    R = math.hypot(delta_x, delta_y)
 
     proj_dist = delta_x * ego_vx + delta_y * ego_vy
     ego_AO = np.arccos(np.clip(proj_dist / (R * ego_v + 1e-8), -1, 1))
@@ -98,10 +100,52 @@ def get2d_AO_TA_R(ego_feature, enm_feature, return_side=False):
     if not return_side:
         return ego_AO, ego_TA, R
     else:
-        side_flag = np.sign(np.cross([ego_vx, ego_vy], [delta_x, delta_y]))
+        cross = ego_vx * delta_y - ego_vy * delta_x
+        side_flag = float(cross > 0) - float(cross < 0)
         return ego_AO, ego_TA, R, side_flag
 
 
+def get_AO_TA_R_pair(ego_feature, enm_feature, return_side=False):
+    """Get AO & TA angles and relative distance of both agents in one pass.
+
+    Args:
+        ego_feature & enemy_feature (tuple): (north, east, down, vn, ve, vd)
+
+    Returns:
+        (tuple): (ego_AO, enm_AO), (ego_TA, enm_TA), R
+    """
+    ego_feature, enm_feature = np.asarray(ego_feature), np.asarray(enm_feature)
+    delta = enm_feature[:3] - ego_feature[:3]
+    velocity = np.array([ego_feature[3:], enm_feature[3:]])
+    return _get_AO_TA_R_pair(delta, velocity, return_side)
+
+
+def get2d_AO_TA_R_pair(ego_feature, enm_feature, return_side=False):
+    ego_feature, enm_feature = np.asarray(ego_feature), np.asarray(enm_feature)
+    delta = enm_feature[:2] - ego_feature[:2]
+    velocity = np.array([ego_feature[3:5], enm_feature[3:5]])
+    return _get_AO_TA_R_pair(delta, velocity, return_side)
+
+
+def _get_AO_TA_R_pair(delta, velocity, return_side):
+    R = math.sqrt(delta @ delta)
+    v = np.sqrt(np.einsum('ij,ij->i', velocity, velocity))
+    proj_dist = velocity @ delta
+    ego_AO, ego_TA = np.arccos(np.clip(proj_dist / (R * v + 1e-8), -1, 1))
+    # enm sees the pair along -delta, so its AO/TA are supplementary to ego's TA/AO
+    AO = np.array([ego_AO, np.pi - ego_TA])
+    TA = np.array([ego_TA, np.pi - ego_AO])
+
+    if not return_side:
+        return AO, TA, R
+    else:
+        # enm's cross product with -delta is the negation of its cross product with delta
+        ego_cross = velocity[0, 0] * delta[1] - velocity[0, 1] * delta[0]
+        enm_cross = velocity[1, 0] * delta[1] - velocity[1, 1] * delta[0]
+        side_flag = (float(ego_cross > 0) - float(ego_cross < 0), float(enm_cross < 0) - float(enm_cross > 0))
+        return AO, TA, R, side_flag
+
+
 def in_range_deg(angle):
     """ Given an angle in degrees, normalises in (-180, 180] """
     angle = angle % 360
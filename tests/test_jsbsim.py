@@ -10,6 +10,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 from envs.JSBSim.envs.singlecontrol_env import SingleControlEnv
 from envs.JSBSim.envs.singlecombat_env import SingleCombatEnv
 from envs.JSBSim.envs.multiplecombat_env import MultipleCombatEnv
+from envs.JSBSim.tasks.singlecombat_task import SingleCombatTask
+from envs.JSBSim.utils.utils import parse_config
 from envs.env_wrappers import DummyVecEnv, SubprocVecEnv, ShareDummyVecEnv, ShareSubprocVecEnv
 
 
@@ -211,6 +213,16 @@ class TestSingleCombatEnv:
                 break
         envs.close()
 
+    def test_normalize_action(self):
+        task = SingleCombatTask(parse_config("1v1/NoWeapon/Selfplay"))
+        # every index matches the original per-dim formula
+        for a in range(41):
+            assert np.allclose(task.normalize_action(None, "A0100", [a, a, a, min(a, 29)]),
+                               [a / 20 - 1., a / 20 - 1., a / 20 - 1., min(a, 29) / 58 + 0.4])
+        # out-of-range indexes stay within their own dim
+        assert np.allclose(task.normalize_action(None, "A0100", [41, -1, 41, 30]), [1., -1., 1., 0.9])
+        assert np.allclose(task.normalize_action(None, "A0100", [-1, 41, -1, -1]), [-1., 1., -1., 0.4])
+
 
 class TestJSBSimRunner:
 
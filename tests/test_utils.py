@@ -0,0 +1,42 @@
+import sys
+import os
+import pytest
+import numpy as np
+from itertools import product
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from envs.JSBSim.utils.utils import get_AO_TA_R, get2d_AO_TA_R, get_AO_TA_R_pair, get2d_AO_TA_R_pair
+
+
+def _random_features(seed, num=32):
+    rng = np.random.default_rng(seed)
+    features = [(rng.uniform(-1e4, 1e4, 6), rng.uniform(-1e4, 1e4, 6)) for _ in range(num)]
+    # R = 0
+    position = rng.uniform(-1e4, 1e4, 3)
+    features.append((np.hstack([position, rng.uniform(-300, 300, 3)]),
+                     np.hstack([position, rng.uniform(-300, 300, 3)])))
+    # zero velocity of ego, enm and both
+    features.append((np.hstack([rng.uniform(-1e4, 1e4, 3), np.zeros(3)]), rng.uniform(-1e4, 1e4, 6)))
+    features.append((rng.uniform(-1e4, 1e4, 6), np.hstack([rng.uniform(-1e4, 1e4, 3), np.zeros(3)])))
+    features.append((np.zeros(6), np.zeros(6)))
+    return features
+
+
+class TestAOTARPair:
+
+    @pytest.mark.parametrize("fns, seed", list(product(
+        [(get_AO_TA_R_pair, get_AO_TA_R), (get2d_AO_TA_R_pair, get2d_AO_TA_R)],
+        [0, 1])))
+    def test_pair_matches_single(self, fns, seed):
+        pair_fn, single_fn = fns
+        for ego_feature, enm_feature in _random_features(seed):
+            AO, TA, R, side_flag = pair_fn(ego_feature, enm_feature, return_side=True)
+            ego_AO, ego_TA, ego_R, ego_side_flag = single_fn(ego_feature, enm_feature, return_side=True)
+            enm_AO, enm_TA, enm_R, enm_side_flag = single_fn(enm_feature, ego_feature, return_side=True)
+            assert np.allclose(AO, [ego_AO, enm_AO]) and np.allclose(TA, [ego_TA, enm_TA])
+            assert np.isclose(R, ego_R) and np.isclose(R, enm_R)
+            assert np.array_equal(side_flag, [ego_side_flag, enm_side_flag])
+            # return_side=False keeps the same geometry
+            AO_, TA_, R_ = pair_fn(ego_feature, enm_feature)
+            assert np.allclose(AO_, AO) and np.allclose(TA_, TA) and R_ == R